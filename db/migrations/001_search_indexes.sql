@@ -0,0 +1,16 @@
+-- Brings a database created from an older db/schema.sql up to date with the
+-- list_books search and category filter indexes. Safe to run more than once.
+ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    to_tsvector('english', title || ' ' || coalesce(description, ''))
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_books_search_vector ON books USING gin (search_vector);
+DROP INDEX IF EXISTS idx_books_title_desc;
+
+CREATE INDEX IF NOT EXISTS idx_book_categories_category_book ON book_categories(category_id, book_id);
+DROP INDEX IF EXISTS idx_book_categories_category_id;
+
+CREATE INDEX IF NOT EXISTS idx_books_author_id ON books(author_id);
+
+ANALYZE books;
+ANALYZE book_categories;
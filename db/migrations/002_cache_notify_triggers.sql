@@ -0,0 +1,21 @@
+-- Adds the NOTIFY triggers that keep the API's author/category caches coherent
+-- across processes (see notify_row_changed in db/schema.sql). Safe to run more
+-- than once.
+CREATE OR REPLACE FUNCTION notify_row_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify(TG_ARGV[0], OLD.id::text);
+    ELSE
+        PERFORM pg_notify(TG_ARGV[0], NEW.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS authors_changed ON authors;
+CREATE TRIGGER authors_changed AFTER INSERT OR UPDATE OR DELETE ON authors
+    FOR EACH ROW EXECUTE FUNCTION notify_row_changed('authors_changed');
+
+DROP TRIGGER IF EXISTS categories_changed ON categories;
+CREATE TRIGGER categories_changed AFTER INSERT OR UPDATE OR DELETE ON categories
+    FOR EACH ROW EXECUTE FUNCTION notify_row_changed('categories_changed');
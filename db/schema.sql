@@ -11,13 +11,35 @@ CREATE TABLE categories (
     name VARCHAR(100) NOT NULL UNIQUE
 );
 
+-- Tell API processes to drop cached authors/categories rows (payload: row id)
+CREATE FUNCTION notify_row_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify(TG_ARGV[0], OLD.id::text);
+    ELSE
+        PERFORM pg_notify(TG_ARGV[0], NEW.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER authors_changed AFTER INSERT OR UPDATE OR DELETE ON authors
+    FOR EACH ROW EXECUTE FUNCTION notify_row_changed('authors_changed');
+
+CREATE TRIGGER categories_changed AFTER INSERT OR UPDATE OR DELETE ON categories
+    FOR EACH ROW EXECUTE FUNCTION notify_row_changed('categories_changed');
+
 CREATE TABLE books (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
     description TEXT,
     price NUMERIC(10,2) NOT NULL CHECK (price >= 0),
     author_id INTEGER NOT NULL REFERENCES authors(id) ON DELETE CASCADE,
-    published_date DATE NOT NULL
+    published_date DATE NOT NULL,
+    -- Full-text document for list_books search; queried directly so the GIN index applies
+    search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('english', title || ' ' || coalesce(description, ''))
+    ) STORED
 );
 
 CREATE TABLE book_categories (
@@ -27,7 +49,8 @@ CREATE TABLE book_categories (
 );
 
 CREATE INDEX idx_books_author_id ON books(author_id);
-CREATE INDEX idx_book_categories_category_id ON book_categories(category_id);
+-- Covers the category filter in list_books without touching the heap
+CREATE INDEX idx_book_categories_category_book ON book_categories(category_id, book_id);
 
 CREATE TABLE users (
     id SERIAL PRIMARY KEY,
@@ -47,4 +70,6 @@ CREATE TABLE logs (
 CREATE INDEX idx_books_title ON books USING gin (to_tsvector('english', title));
 
 -- For fast general search
-CREATE INDEX idx_books_title_desc ON books USING gin (to_tsvector('english', title || ' ' || description));
+CREATE INDEX idx_books_search_vector ON books USING gin (search_vector);
+
+-- Run ANALYZE after loading data so the planner has stats for these indexes
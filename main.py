@@ -1,10 +1,24 @@
+import re
+import asyncpg
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from db.db import db
 from pydantic import BaseModel
 from datetime import date
+from contextlib import asynccontextmanager
 
-app = FastAPI()
+
+# ------------ DB Startup/Shutdown ------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The pool opens its min_size connections and prepares the hot statements on
+    # each of them up front, so the first requests don't pay connect/parse cost
+    await db.connect()
+    yield
+    await db.disconnect()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 
 # ---- Pydantic Schemas (request/response models) ----
@@ -60,16 +74,6 @@ class UserOut(BaseModel):
     username: str
     email: str
 
-# ------------ DB Startup/Shutdown ------------
-@app.on_event("startup")
-async def startup():
-    await db.connect()
-
-@app.on_event("shutdown")
-async def shutdown():
-    await db.disconnect()
-
-
 # ------------ Authors Endpoints ------------
 @app.post("/authors/", response_model=AuthorOut)
 async def create_author(author: AuthorIn):
@@ -87,7 +91,9 @@ async def get_author(author_id: int):
 
 @app.get("/authors/", response_model=List[AuthorOut])
 async def list_authors():
-    return await db.list_authors()
+    # Rows already match the response model; returning a response directly skips
+    # re-validating them (same for list_categories and list_books)
+    return ORJSONResponse(await db.list_authors())
 
 # ------------ Categories Endpoints ------------
 @app.post("/categories/", response_model=CategoryOut)
@@ -106,23 +112,35 @@ async def get_category(category_id: int):
 
 @app.get("/categories/", response_model=List[CategoryOut])
 async def list_categories():
-    return await db.list_categories()
+    return ORJSONResponse(await db.list_categories())
 
 # ------------ Books CRUD ------------
+def invalid_book_ref(e: asyncpg.ForeignKeyViolationError) -> HTTPException:
+    # validate_book_refs trusts cached ids, so a row deleted elsewhere can still
+    # reach the insert; report it like a failed validation instead of a 500
+    if e.constraint_name == "books_author_id_fkey":
+        return HTTPException(status_code=400, detail="Invalid author_id")
+    # e.detail reads 'Key (category_id)=(42) is not present in table "categories".'
+    m = re.search(r"\)=\((\d+)\)", e.detail or "")
+    missing = [int(m.group(1))] if m else []
+    return HTTPException(status_code=400, detail=f"Invalid category_id {missing}")
+
 @app.post("/books/", response_model=BookOut)
 async def create_book(book: BookIn):
     # Validate author and categories
-    if not await db.get_author_by_id(book.author_id):
+    author_ok, missing = await db.validate_book_refs(book.author_id, book.category_ids)
+    if not author_ok:
         raise HTTPException(status_code=400, detail="Invalid author_id")
-    for cid in book.category_ids:
-        if not await db.get_category_by_id(cid):
-            raise HTTPException(status_code=400, detail=f"Invalid category_id {cid}")
-    row = await db.create_book(
-        book.title, book.description, book.price,
-        book.author_id, book.published_date, book.category_ids
-    )
-    # Get full book (including categories)
-    return await db.get_book_by_id(row['id'])
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Invalid category_id {missing}")
+    # Returns the full book (including categories)
+    try:
+        return await db.create_book(
+            book.title, book.description, book.price,
+            book.author_id, book.published_date, book.category_ids
+        )
+    except asyncpg.ForeignKeyViolationError as e:
+        raise invalid_book_ref(e) from e
 
 @app.get("/books/{book_id}", response_model=BookOut)
 async def get_book(book_id: int):
@@ -133,25 +151,28 @@ async def get_book(book_id: int):
 
 @app.put("/books/{book_id}", response_model=BookOut)
 async def update_book(book_id: int, book_update: BookUpdateIn):
-    if book_update.author_id and not await db.get_author_by_id(book_update.author_id):
-        raise HTTPException(status_code=400, detail="Invalid author_id")
-    if book_update.category_ids:
-        for cid in book_update.category_ids:
-            if not await db.get_category_by_id(cid):
-                raise HTTPException(status_code=400, detail=f"Invalid category_id {cid}")
-    b = await db.update_book(
-        book_id,
-        book_update.title,
-        book_update.description,
-        book_update.price,
-        book_update.author_id,
-        book_update.published_date,
-        book_update.category_ids
-    )
+    if book_update.author_id or book_update.category_ids:
+        author_ok, missing = await db.validate_book_refs(book_update.author_id or None, book_update.category_ids or [])
+        if not author_ok:
+            raise HTTPException(status_code=400, detail="Invalid author_id")
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Invalid category_id {missing}")
+    # Returns the full book (including categories)
+    try:
+        b = await db.update_book(
+            book_id,
+            book_update.title,
+            book_update.description,
+            book_update.price,
+            book_update.author_id,
+            book_update.published_date,
+            book_update.category_ids
+        )
+    except asyncpg.ForeignKeyViolationError as e:
+        raise invalid_book_ref(e) from e
     if not b:
         raise HTTPException(status_code=404, detail="Book not found")
-    # Return full book with categories
-    return await db.get_book_by_id(book_id)
+    return b
 
 @app.delete("/books/{book_id}")
 async def delete_book(book_id: int):
@@ -182,7 +203,7 @@ async def list_books(
     if background_tasks is not None:
         details = {"author_id": author_id, "category_id": category_id, "search": search, "limit": limit, "offset": offset}
         background_tasks.add_task(db.log_action, user_id, "search_books", details)
-    return books
+    return ORJSONResponse(books)
 
 # ------------ Users CRUD ------------
 @app.post("/users/", response_model=UserOut)